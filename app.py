@@ -1,29 +1,43 @@
 import os
-from flask import Flask, request, jsonify, send_from_directory
-from werkzeug.utils import secure_filename
+import functools
+import hashlib
+import json
+import multiprocessing
+import queue
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, request, jsonify, send_from_directory, abort
 import google.generativeai as genai
+import fitz  # PyMuPDF
 from paddleocr import PaddleOCR
-from pdf2image import convert_from_path
-import re
+from paddleocr.paddleocr import (
+    BASE_DIR as PADDLEOCR_HOME,
+    DEFAULT_OCR_MODEL_VERSION,
+    confirm_model_dir_url,
+    get_model_config,
+    maybe_download,
+    parse_lang
+)
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
+import re2  # google-re2: linear-time matching, no backtracking
 import numpy as np
 from dotenv import load_dotenv
 import logging
-import traceback
-
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging; set LOG_LEVEL=DEBUG or INFO to trace each request
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper())
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
-# Ensure upload directory exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-
 # Configure Gemini API
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 if not GEMINI_API_KEY:
@@ -31,50 +45,262 @@ if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY environment variable is required")
 
 genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash')
-
-# Initialize PaddleOCR
-try:
-    ocr = PaddleOCR(use_angle_cls=True, lang='en')
-    logger.info("PaddleOCR initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize PaddleOCR: {str(e)}")
-    raise
-
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF using PaddleOCR"""
-    # Convert PDF to images
-    images = convert_from_path(pdf_path)
-    
-    # Extract text from each page
-    text = ""
-    for image in images:
-        # Convert PIL image to numpy array
-        image_array = np.array(image)
-        result = ocr.ocr(image_array)
-        if result is not None:  # Check if result exists
-            for line in result[0]:  # Access the first element of result
-                if line is not None and len(line) >= 2:  # Check if line exists and has enough elements
-                    text += line[1][0] + "\n"  # Access the text content
-    
-    return text
+
+@functools.lru_cache(maxsize=None)
+def get_model():
+    """Return the shared Gemini model, creating it on first use"""
+    return genai.GenerativeModel('gemini-1.5-flash')
+
+# Cache of Gemini responses keyed by a hash of the normalized input text
+RESPONSE_CACHE_SIZE = 256
+response_cache = OrderedDict()
+response_cache_lock = threading.Lock()
+
+def generate_cached(kind, text, prompt, generation_config=None, parse=None):
+    """Return Gemini's response to prompt, reusing a cached one for identical text
+
+    If parse is given it is applied to the response text before caching; it
+    should validate the response and raise on anything malformed, so that bad
+    responses are never cached.
+    """
+    normalized = ' '.join(text.split())
+    key = hashlib.sha256(f"{kind}:{normalized}".encode('utf-8')).hexdigest()
+
+    with response_cache_lock:
+        cached = response_cache.get(key)
+        if cached is not None:
+            response_cache.move_to_end(key)
+    if cached is not None:
+        logger.info("cache_hit: %s", kind)
+        return cached
+
+    response = get_model().generate_content(prompt, generation_config=generation_config)
+    if not response or not response.text:
+        raise ValueError("Empty response from Gemini API")
+    result = parse(response.text) if parse else response.text
+
+    with response_cache_lock:
+        response_cache[key] = result
+        if len(response_cache) > RESPONSE_CACHE_SIZE:
+            response_cache.popitem(last=False)  # Evict the least recently used entry
+    return result
+
+def get_model_dir(env_var, default_path):
+    """Return an OCR model directory if it exists, otherwise None (stock model)"""
+    path = os.getenv(env_var, default_path)
+    return path if os.path.isdir(path) else None
+
+def ocr_model_dirs():
+    """Return the det/rec/cls model directories passed to PaddleOCR"""
+    return {
+        'det': get_model_dir('OCR_DET_MODEL_DIR', './models/det_slim'),
+        'rec': get_model_dir('OCR_REC_MODEL_DIR', './models/rec_slim'),
+        'cls': get_model_dir('OCR_CLS_MODEL_DIR', './models/cls_slim')
+    }
+
+def download_ocr_models():
+    """Fetch any missing PaddleOCR models, mirroring what PaddleOCR() does on init"""
+    lang, det_lang = parse_lang('en')
+    model_dirs = ocr_model_dirs()
+    for model_type, model_lang, default_dir in (
+        ('det', det_lang, os.path.join(PADDLEOCR_HOME, 'whl', 'det', det_lang)),
+        ('rec', lang, os.path.join(PADDLEOCR_HOME, 'whl', 'rec', lang)),
+        ('cls', 'ch', os.path.join(PADDLEOCR_HOME, 'whl', 'cls'))
+    ):
+        config = get_model_config('OCR', DEFAULT_OCR_MODEL_VERSION, model_type, model_lang)
+        model_dir, url = confirm_model_dir_url(model_dirs[model_type], default_dir, config['url'])
+        maybe_download(model_dir, url)  # No-op when the model is already there
+
+# Every web server process (WEB_CONCURRENCY, see gunicorn.conf.py) has its own
+# OCR pool, so the OCR budget is shared across all of them. By default half the
+# cores go to OCR processes per host, at most 4 per pool.
+CPU_COUNT = os.cpu_count() or 1
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+OCR_WORKERS = int(os.getenv('OCR_WORKERS', max(1, min(4, (CPU_COUNT // 2) // WEB_CONCURRENCY))))
+OCR_PROCESSES = WEB_CONCURRENCY * OCR_WORKERS  # OCR processes on this host
+
+@functools.lru_cache(maxsize=None)
+def get_ocr():
+    """Return the shared PaddleOCR instance, initializing it on first use"""
+    try:
+        # rec_batch_num=1: larger batches only grow the CPU memory arena, resumes
+        # are recognized line by line anyway
+        # INT8 slim models are used when present; MKLDNN enables the int8 CPU kernels.
+        # Half the cores go to OCR, split across every OCR process on the host
+        # (at least one thread each), leaving headroom for Flask and Poppler.
+        model_dirs = ocr_model_dirs()
+        ocr = PaddleOCR(
+            use_angle_cls=True,
+            lang='en',
+            rec_batch_num=1,
+            det_model_dir=model_dirs['det'],
+            rec_model_dir=model_dirs['rec'],
+            cls_model_dir=model_dirs['cls'],
+            enable_mkldnn=True,
+            show_log=False,  # Paddle's per-call info logs are costly on long resumes
+            cpu_threads=max(1, CPU_COUNT // (2 * OCR_PROCESSES))
+        )
+        logger.info("PaddleOCR initialized successfully")
+        return ocr
+    except Exception as e:
+        logger.error("Failed to initialize PaddleOCR: %s", e)
+        raise
+
+def init_ocr_worker():
+    """Load PaddleOCR once per worker process"""
+    get_ocr()
+
+# Shared pool of OCR worker processes; the lock keeps concurrent request
+# threads from each starting their own pool
+ocr_pool = None
+ocr_pool_lock = threading.Lock()
+
+def get_ocr_pool():
+    """Return the shared pool of OCR worker processes, starting it on first use"""
+    global ocr_pool
+    with ocr_pool_lock:
+        if ocr_pool is None:
+            # spawn rather than fork: Paddle and the rasterizer thread are not fork-safe
+            ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_ocr_worker
+            )
+        return ocr_pool
+
+def discard_ocr_pool(pool):
+    """Shut down a broken OCR pool so the next request starts a fresh one"""
+    global ocr_pool
+    with ocr_pool_lock:
+        if ocr_pool is pool:  # Another request may already have replaced it
+            ocr_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+# PaddleOCR workers download missing models into a shared temp path on init,
+# so concurrent workers would race; fetch them once here in the parent process
+# (the gunicorn master, since the app is preloaded) before any worker starts
+if multiprocessing.parent_process() is None:
+    try:
+        download_ocr_models()
+    except Exception as e:
+        logger.error("Failed to download PaddleOCR models: %s", e)
+        raise
+
+def ocr_page(image_path):
+    """OCR a single page image, returning its lines of text"""
+    with Image.open(image_path) as image:
+        rgb_image = image if image.mode == 'RGB' else image.convert('RGB')
+        # View the decoded page as a numpy array without a second copy;
+        # both images are closed before OCR so only the array stays alive
+        image_array = np.ascontiguousarray(np.asarray(rgb_image))
+        if rgb_image is not image:
+            rgb_image.close()
+    result = get_ocr().ocr(image_array)
+
+    lines = []
+    if result is not None:  # Check if result exists
+        for line in result[0]:  # Access the first element of result
+            if line is not None and len(line) >= 2:  # Check if line exists and has enough elements
+                lines.append(line[1][0])  # Access the text content
+    return lines
+
+# Rasterization resolution; 150 DPI keeps 10-12pt text legible with ~44% fewer
+# pixels than pdf2image's default of 200. Raise it if OCR accuracy suffers.
+OCR_DPI = int(os.getenv('OCR_DPI', 150))
+
+def rasterize_pages(pdf_path, page_count, output_folder, pages):
+    """Rasterize a PDF one page at a time, putting each image path on the queue"""
+    try:
+        for page_number in range(1, page_count + 1):
+            image_paths = convert_from_path(
+                pdf_path,
+                dpi=OCR_DPI,
+                first_page=page_number,
+                last_page=page_number,
+                output_folder=output_folder,
+                fmt='jpeg',
+                paths_only=True
+            )
+            for image_path in image_paths:
+                pages.put(image_path)
+    finally:
+        pages.put(None)  # Signal that no more pages are coming
+
+def ocr_text_from_pdf(pdf_bytes):
+    """Extract text from PDF bytes using PaddleOCR"""
+    pool = get_ocr_pool()
+    with tempfile.TemporaryDirectory() as tmpdir, ThreadPoolExecutor(max_workers=1) as executor:
+        # Poppler needs a file; write the upload once and rasterize every page from it
+        pdf_path = os.path.join(tmpdir, 'resume.pdf')
+        with open(pdf_path, 'wb') as pdf_file:
+            pdf_file.write(pdf_bytes)
+        page_count = pdfinfo_from_path(pdf_path)['Pages']
+
+        # Rasterize pages in the background and OCR each one in the process
+        # pool as soon as it is ready
+        pages = queue.Queue(maxsize=2)
+        producer = executor.submit(rasterize_pages, pdf_path, page_count, tmpdir, pages)
+
+        futures = []
+        try:
+            while True:
+                image_path = pages.get()
+                if image_path is None:
+                    break
+                futures.append(pool.submit(ocr_page, image_path))
+
+            producer.result()  # Re-raise any rasterization error
+            page_lines = [future.result() for future in futures]  # Keep page order
+        except BaseException as e:
+            for future in futures:
+                future.cancel()
+            # Drain the queue so the producer is never left blocked on put()
+            while not producer.done():
+                if pages.get() is None:
+                    break
+            if isinstance(e, BrokenProcessPool):
+                discard_ocr_pool(pool)
+            raise
+
+    return "\n".join(line for lines in page_lines for line in lines)
+
+# Text layers shorter than this are treated as scanned and sent to OCR
+MIN_TEXT_LAYER_LENGTH = 200
+
+def extract_text_from_pdf(pdf_bytes):
+    """Extract text from PDF bytes, using the text layer when present and OCR otherwise"""
+    try:
+        with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+            text = "\n".join(page.get_text() for page in doc)
+        if len(text.strip()) >= MIN_TEXT_LAYER_LENGTH:
+            logger.info("Using embedded PDF text layer")
+            return text
+    except Exception as e:
+        logger.warning("Failed to read PDF text layer: %s", e)
+
+    logger.info("Falling back to OCR")
+    return ocr_text_from_pdf(pdf_bytes)
+
+# Contact info patterns, compiled once at import
+EMAIL_RE = re2.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+# Various formats; RE2's \d is ASCII-only, so non-ASCII digits never match
+PHONE_RE = re2.compile(r'(?:\+\d{1,3}[-. ]?)?\(?\d{3}\)?[-. ]?\d{3}[-. ]?\d{4}')
+
+def first_match(pattern, text):
+    """Return the first match of pattern in text, or None"""
+    # search() stops at the first match, which is normally in the resume header
+    match = pattern.search(text)
+    return match.group(0) if match else None
 
 def extract_contact_info(text):
     """Extract name, email, and phone from text"""
-    # Email pattern
-    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails = re.findall(email_pattern, text)
-    email = emails[0] if emails else None
-
-    # Phone pattern (various formats)
-    phone_pattern = r'(?:\+\d{1,3}[-. ]?)?\(?\d{3}\)?[-. ]?\d{3}[-. ]?\d{4}'
-    phones = re.findall(phone_pattern, text)
-    phone = phones[0] if phones else None
+    email = first_match(EMAIL_RE, text)
+    phone = first_match(PHONE_RE, text)
 
     # Name extraction (first line or after "Name:" or similar)
     name = None
-    lines = text.split('\n')
-    for line in lines[:5]:  # Check first 5 lines
+    lines = text.split('\n', 5)[:5]  # Check first 5 lines without splitting the whole text
+    for line in lines:
         if line.strip() and not any(char.isdigit() for char in line):
             name = line.strip()
             break
@@ -85,136 +311,164 @@ def extract_contact_info(text):
         'phone': phone
     }
 
-def analyze_resume(text):
-    """Analyze resume using Gemini API"""
+# Static instructions are kept in constants and placed before the per-request
+# text, so the prompt prefix is byte-for-byte stable; this saves nothing today,
+# but lets the prefix be moved into explicit context caching later.
+ANALYSIS_INSTRUCTIONS = """
+Analyze the resume text at the end of this prompt and provide:
+1. A score out of 100 based on:
+   - Content completeness
+   - Professional presentation
+   - Skills and experience relevance
+   - Grammar and formatting
+2. Detailed analysis of strengths and weaknesses
+3. Areas for improvement
+4. 3 specific online courses that would help improve the candidate's skills and address their areas for improvement
+
+Respond with a single JSON object of the following shape:
+{
+  "score": [number],
+  "analysis": "[detailed analysis, markdown allowed]",
+  "improvements": "[specific areas for improvement, markdown allowed]",
+  "recommendations": [
+    {"title": "[course title]", "description": "[brief description]", "link": "[course URL]"}
+  ]
+}
+"""
+
+ANALYSIS_GENERATION_CONFIG = {'response_mime_type': 'application/json'}
+
+FALLBACK_RECOMMENDATIONS = [
+    {
+        'title': 'Professional Development Course',
+        'description': 'Enhance your professional skills with this comprehensive course.',
+        'link': 'https://www.coursera.org/learn/professional-development'
+    },
+    {
+        'title': 'Technical Skills Training',
+        'description': 'Improve your technical expertise with hands-on projects.',
+        'link': 'https://www.udemy.com/courses/development/'
+    },
+    {
+        'title': 'Soft Skills Workshop',
+        'description': 'Develop essential soft skills for career growth.',
+        'link': 'https://www.linkedin.com/learning/'
+    }
+]
+
+def as_markdown(value):
+    """Render a JSON value from Gemini as markdown text"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return "\n\n".join(
+            f"**{key}:**\n{as_markdown(item)}" if isinstance(item, (dict, list))
+            else f"**{key}:** {as_markdown(item)}"
+            for key, item in value.items()
+        )
+    if isinstance(value, list):
+        return "\n".join(f"- {as_markdown(item)}" for item in value)
+    return str(value)
+
+# Leading integer of a score such as 85, "85", "85/100" or "85 out of 100"
+SCORE_RE = re2.compile(r'^\s*(\d+)')
+
+def parse_score(value):
+    """Return a score clamped to 0-100, or None if value has no leading integer"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        try:
+            score = int(value)
+        except (ValueError, OverflowError):  # NaN or Infinity
+            return None
+    elif isinstance(value, str):
+        match = SCORE_RE.search(value)
+        if not match:
+            return None
+        score = int(match.group(1))
+    else:
+        return None
+    return max(0, min(100, score))
+
+def parse_analysis_response(response_text):
+    """Parse and normalize Gemini's JSON analysis, raising ValueError if it is malformed"""
     try:
-        prompt = f"""
-        Analyze the following resume text and provide:
-        1. A score out of 100 based on:
-           - Content completeness
-           - Professional presentation
-           - Skills and experience relevance
-           - Grammar and formatting
-        2. Detailed analysis of strengths and weaknesses
-        3. Areas for improvement
-
-        Resume text:
-        {text}
-
-        Provide the response in the following format:
-        Score: [number]
-        Analysis: [detailed analysis]
-        Areas for Improvement: [specific areas]
-        """
-
-        response = model.generate_content(prompt)
-        if not response or not response.text:
-            raise ValueError("Empty response from Gemini API")
-        return response.text
-    except Exception as e:
-        logger.error(f"Error in analyze_resume: {str(e)}")
-        raise
+        result = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.error("Invalid JSON from Gemini API: %s", e)
+        raise ValueError("Invalid response from Gemini API") from e
+    if not isinstance(result, dict):
+        logger.error("Unexpected JSON from Gemini API: %s", type(result).__name__)
+        raise ValueError("Invalid response from Gemini API")
+
+    score = parse_score(result.get('score'))
+    if score is None:
+        logger.error("Missing or non-numeric score from Gemini API: %r", result.get('score'))
+        raise ValueError("Invalid response from Gemini API")
+
+    analysis = as_markdown(result.get('analysis'))
+    if not analysis.strip():
+        logger.error("Empty analysis from Gemini API")
+        raise ValueError("Invalid response from Gemini API")
+    improvements = as_markdown(result.get('improvements'))
+    if improvements:
+        analysis += f"\n\n**Areas for Improvement:**\n\n{improvements}"
+
+    courses = result.get('recommendations')
+    recommendations = [
+        {
+            'title': as_markdown(course.get('title')),
+            'description': as_markdown(course.get('description')),
+            'link': as_markdown(course.get('link'))
+        }
+        for course in (courses if isinstance(courses, list) else [])
+        if isinstance(course, dict)
+    ]
+
+    # Only add fallback recommendations if we have no valid recommendations
+    if not recommendations:
+        recommendations = FALLBACK_RECOMMENDATIONS
 
-def extract_score_from_analysis(analysis_text):
-    """Extract score from analysis text"""
-    try:
-        # Look for score in the format "Score: [number]"
-        score_match = re.search(r'Score:\s*(\d+)', analysis_text)
-        if score_match:
-            return int(score_match.group(1))
-        return 0
-    except Exception as e:
-        logger.error(f"Error extracting score: {str(e)}")
-        return 0
+    return {
+        'score': score,
+        'analysis': analysis,
+        'recommendations': recommendations[:3]  # Return only the first 3 recommendations
+    }
 
-def get_course_recommendations(analysis):
-    """Get course recommendations based on resume analysis"""
+def analyze_resume(text):
+    """Score, analyze and recommend courses for a resume in a single Gemini call"""
     try:
-        prompt = f"""
-        Based on the following resume analysis, recommend 3 specific online courses that would help improve the candidate's skills and address their areas for improvement.
-
-        Analysis:
-        {analysis}
-
-        Provide the recommendations in the following format:
-        Course 1:
-        Title: [course title]
-        Description: [brief description]
-        Link: [course URL]
-
-        Course 2:
-        Title: [course title]
-        Description: [brief description]
-        Link: [course URL]
-
-        Course 3:
-        Title: [course title]
-        Description: [brief description]
-        Link: [course URL]
-        """
-
-        response = model.generate_content(prompt)
-        if not response or not response.text:
-            raise ValueError("Empty response from Gemini API")
-        
-        # Parse the response into structured format
-        recommendations = []
-        current_course = {}
-        lines = response.text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('Course'):
-                if current_course:
-                    recommendations.append(current_course)
-                current_course = {}
-            elif line.startswith('Title:'):
-                current_course['title'] = line.replace('Title:', '').strip()
-            elif line.startswith('Description:'):
-                current_course['description'] = line.replace('Description:', '').strip()
-            elif line.startswith('Link:'):
-                current_course['link'] = line.replace('Link:', '').strip()
-        
-        # Add the last course if exists
-        if current_course:
-            recommendations.append(current_course)
-        
-        # Only add fallback recommendations if we have no valid recommendations
-        if not recommendations:
-            recommendations = [
-                {
-                    'title': 'Professional Development Course',
-                    'description': 'Enhance your professional skills with this comprehensive course.',
-                    'link': 'https://www.coursera.org/learn/professional-development'
-                },
-                {
-                    'title': 'Technical Skills Training',
-                    'description': 'Improve your technical expertise with hands-on projects.',
-                    'link': 'https://www.udemy.com/courses/development/'
-                },
-                {
-                    'title': 'Soft Skills Workshop',
-                    'description': 'Develop essential soft skills for career growth.',
-                    'link': 'https://www.linkedin.com/learning/'
-                }
-            ]
-        
-        return recommendations[:3]  # Return only the first 3 recommendations
-
+        prompt = f"{ANALYSIS_INSTRUCTIONS}\nResume text:\n{text}"
+        return generate_cached('analysis', text, prompt, ANALYSIS_GENERATION_CONFIG,
+                               parse=parse_analysis_response)
     except Exception as e:
-        logger.error(f"Error in get_course_recommendations: {str(e)}")
+        logger.error("Error in analyze_resume: %s", e)
         raise
 
 @app.route('/')
 def serve_frontend():
     return send_from_directory('.', 'index.html')
 
+# Only the frontend is served; everything else in the project root (.env,
+# app.py, ...) stays private
+FRONTEND_FILES = {'index.html', 'script.js', 'styles.css'}
+
 @app.route('/<path:path>')
 def serve_static(path):
+    if path not in FRONTEND_FILES:
+        abort(404)
     return send_from_directory('.', path)
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
+    # Reject oversize uploads from the Content-Length header, before the body is parsed
+    max_length = app.config['MAX_CONTENT_LENGTH']
+    if request.content_length is not None and request.content_length > max_length:
+        return jsonify({'error': 'File is too large (16MB max)'}), 413
+
     if 'resume' not in request.files:
         return jsonify({'error': 'No file uploaded'}), 400
     
@@ -225,56 +479,45 @@ def analyze():
     if not file.filename.endswith('.pdf'):
         return jsonify({'error': 'Only PDF files are supported'}), 400
 
-    try:
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        logger.info(f"File saved successfully: {filepath}")
+    if file.content_length and file.content_length > max_length:
+        return jsonify({'error': 'File is too large (16MB max)'}), 413
 
+    # Check the PDF magic number before reading the whole file
+    if file.stream.read(5) != b'%PDF-':
+        return jsonify({'error': 'Not a PDF'}), 400
+    file.stream.seek(0)
+
+    try:
         # Extract text from PDF
-        logger.info("Starting text extraction from PDF")
-        text = extract_text_from_pdf(filepath)
+        logger.debug("Starting text extraction from PDF")
+        text = extract_text_from_pdf(file.read())
         if not text.strip():
             raise ValueError("No text could be extracted from the PDF")
-        logger.info(f"Extracted text length: {len(text)}")
+        logger.debug("Extracted text length: %d", len(text))
 
         # Extract contact information
-        logger.info("Extracting contact information")
+        logger.debug("Extracting contact information")
         contact_info = extract_contact_info(text)
-        logger.info(f"Contact info extracted: {contact_info}")
-
-        # Analyze resume
-        logger.info("Starting resume analysis")
-        analysis = analyze_resume(text)
-        logger.info("Resume analysis completed")
-
-        # Extract score from analysis
-        score = extract_score_from_analysis(analysis)
-        logger.info(f"Extracted score: {score}")
-
-        # Get course recommendations
-        logger.info("Getting course recommendations")
-        recommendations = get_course_recommendations(analysis)
-        logger.info("Course recommendations generated")
+        logger.debug("Contact info extracted: %s", contact_info)
 
-        # Clean up uploaded file
-        os.remove(filepath)
-        logger.info("Temporary file removed")
+        # Analyze resume and get course recommendations
+        logger.debug("Starting resume analysis")
+        result = analyze_resume(text)
+        logger.info("Resume analysis completed, score: %s", result['score'])
 
         return jsonify({
             'name': contact_info['name'],
             'email': contact_info['email'],
             'phone': contact_info['phone'],
-            'score': score,  # Use the extracted score instead of hardcoded value
-            'analysis': analysis,
-            'recommendations': recommendations
+            'score': result['score'],
+            'analysis': result['analysis'],
+            'recommendations': result['recommendations']
         })
 
     except Exception as e:
-        logger.error(f"Error processing resume: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error processing resume: %s", e)
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    # Development server only; use gunicorn (see gunicorn.conf.py) in production
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1') 
\ No newline at end of file
@@ -0,0 +1,19 @@
+import os
+
+# Import the app (and its heavy Paddle/Gemini libraries) once in the master
+# so workers fork with the modules already loaded
+preload_app = True
+
+# OCR runs in each worker's own process pool (see OCR_WORKERS), so a few
+# threaded workers are enough; the threads overlap Gemini HTTP waits
+# Exported so the app can size its per-worker OCR pools to the host
+os.environ.setdefault('WEB_CONCURRENCY', '2')
+workers = int(os.environ['WEB_CONCURRENCY'])
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+# OCR of a scanned multi-page resume plus the Gemini call can take a while
+timeout = 120
+
+# Local-only by default; set BIND (e.g. 0.0.0.0:5000) to listen on other interfaces
+bind = os.getenv('BIND', '127.0.0.1:5000')